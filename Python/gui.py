@@ -12,25 +12,50 @@
 #
 ##################################################################################################################
 
-import tkinter.filedialog
 import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import dearpygui.dearpygui as dpg
 import time
 import os
 from math import ceil
 import modules.gui_style as style
-from modules.sensor_data_manager import SensorDataManager, post_process_dataframe
-from modules.tcp_client import TCPClient, get_current_network
 from modules.global_settings import *
+# Note: modules.sensor_data_manager and modules.tcp_client are imported lazily in setup_gui, after
+# the viewport is shown - they pull in pandas/scipy/matplotlib, which would otherwise delay the
+# first frame by several seconds.
 
 class AccelerometerReaderGUI:
     def __init__(self):
-        self.data_manager = SensorDataManager()
-        self.tcp_client = TCPClient(self.data_manager)
+        # Constructed in setup_gui once the window is visible (lazy import of the heavy modules)
+        self.data_manager = None
+        self.tcp_client = None
+        # Rows arriving from the TCP thread are buffered here and flushed once per rendered frame.
+        # The cap drops the oldest rows (FIFO) so a backlog cannot cause catch-up lag in the GUI.
+        self._pending_rows = deque(maxlen=PENDING_ROWS_CAP)
+        # Small pool for blocking I/O (network scans, connecting, processing) so the GUI thread
+        # never stalls on a subprocess or socket call.
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        # Shared dispatch table for the command widgets - one callback created per command instead
+        # of a fresh closure per widget definition. These must be plain functions: DPG's dispatcher
+        # inspects __code__ to count arguments and silently never invokes callables without it
+        # (such as functools.partial objects).
+        self._command_callbacks = {command: (lambda sender=None, app_data=None, command=command:
+                                             self._command_callback(sender, command))
+                                   for command in ("SET_DATARATE", "SET_RANGE", "START", "STOP")}
+        # Next data log row to overwrite; the log is a fixed pool of pre-created rows (see
+        # _create_data_acquisition_tab), so writing a reading is five set_value calls and clearing is
+        # a cursor reset instead of deleting and re-creating widgets.
+        self._row_cursor = 0
         self.save_directory_path = None
         self.open_directory_path = None
         self.stop_plot_event = threading.Event()
         self.stop_plot_event.set()
+        # Set when the live-plot window closes so the plotting thread exits instead of lingering
+        self._plot_thread_exit = threading.Event()
+        # sensor_id -> (x-axis tags, y-axis tags, plot tags), filled when the live-plot window is
+        # built so the plotting loop does not rebuild the same f-strings every frame
+        self._tag_cache = {}
         self.live_plotting_thread = None
         self.post_processing_sensors = []
         # Set-up gui upon initialization
@@ -40,15 +65,36 @@ class AccelerometerReaderGUI:
         """Sets up the GUI for the accelerometer reader."""
         dpg.create_context()
         dpg.create_viewport(title='Accelerometer controller', width=1300, height=800)
+        # Shared value registry for the texts that stream updates from the data threads. The widgets
+        # bind to these entries via source=, so a set_value only writes the registry value instead of
+        # going through a widget-tree lookup per update.
+        with dpg.value_registry():
+            dpg.add_string_value(tag=STATUS, default_value="Ready")
+            dpg.add_string_value(tag="connection_warning", default_value="")
+            dpg.add_string_value(tag="actual_interval_info", default_value="")
+            dpg.add_string_value(tag="interval_mismatch_info", default_value="")
         self._create_main_window()
+        # Hidden directory picker reused for both the save and open selections. It runs on the DPG
+        # event loop, so picking a folder does not bootstrap a whole Tk interpreter each time.
+        dpg.add_file_dialog(directory_selector=True, show=False, modal=True, width=600, height=400,
+                            callback=self._on_directory_picked, tag="directory_dialog")
+        self._build_processing_window()
         style.setup_gui_theme()
         dpg.set_primary_window("accelerometer_control", True)
         dpg.setup_dearpygui()
         # Reset the sensors when closing the program window
         dpg.set_exit_callback(callback=lambda: self.tcp_client.reset_sensors())
         dpg.show_viewport()
-        # Check network connection before the user does anything else
-        get_current_network()
+        # Deferred imports - the window above appears immediately while the heavy numeric libraries
+        # these modules drag in (pandas, scipy, matplotlib) load afterwards.
+        from modules.sensor_data_manager import SensorDataManager
+        from modules.tcp_client import TCPClient, get_current_network
+        self.data_manager = SensorDataManager()
+        self.tcp_client = TCPClient(self.data_manager, self._pending_rows)
+        dpg.set_value("expected_interval_info", str(self.data_manager.params[2]))
+        # Check network connection before the user does anything else - in the background, so the
+        # freshly shown window does not freeze on the subprocess call.
+        self._io_pool.submit(get_current_network)
 
     def _create_main_window(self):
         """Creates the primary window for the GUI."""
@@ -68,16 +114,16 @@ class AccelerometerReaderGUI:
                     dpg.add_text("Datarate")
                     dpg.add_combo(["1 Hz", "10 Hz", "25 Hz", "50 Hz", "100 Hz"],
                                   default_value="1 Hz", tag="datarate_choice", width=100,
-                                  callback=lambda: self._command_callback(None, "SET_DATARATE"))
+                                  callback=self._command_callbacks["SET_DATARATE"])
                     dpg.add_text("Range")
                     dpg.add_combo(["2 G", "4 G", "8 G", "16 G"],
                                   default_value="2 G", tag="range_choice", width=55,
-                                  callback=lambda: self._command_callback(None, "SET_RANGE"))
+                                  callback=self._command_callbacks["SET_RANGE"])
                     dpg.add_button(label="Connect", tag="connect_button", callback=self._connect_callback)
                     dpg.add_button(label="Disconnect", tag="disconnect_button", callback=self._disconnect_callback)
                 with dpg.group(horizontal=True):
                     dpg.add_text("Connection status: Not connected", tag="connection_status")
-                    dpg.add_text("", tag="connection_warning",  color=(178, 34, 34), wrap=600, indent=240)
+                    dpg.add_text(source="connection_warning",  color=(178, 34, 34), wrap=600, indent=240)
                 with dpg.tab_bar(label="tab_bar"):
                     dpg.add_tab(label="Data acquisition", tag="data_acquisition_tab")
                     dpg.add_tab(label="Post-processing", tag="post_processing_tab")
@@ -86,7 +132,7 @@ class AccelerometerReaderGUI:
             # Status bar to communicate with the user rather than have to look at the Python IDE
             dpg.add_separator()
             dpg.add_text("Status:", tag="status_header")
-            dpg.add_text("Ready", tag=STATUS)
+            dpg.add_text(source=STATUS)
 
     def _create_data_acquisition_tab(self):
         """Creates the contents of the data acquisition tab."""
@@ -95,8 +141,8 @@ class AccelerometerReaderGUI:
             # Control buttons on the menu bar
             # Control buttons on the menu bar
             with dpg.group(horizontal=True):
-                dpg.add_button(label="Start recording", callback=lambda: self._command_callback(None, "START"))
-                dpg.add_button(label="Stop recording", callback=lambda: self._command_callback(None, "STOP"))
+                dpg.add_button(label="Start recording", callback=self._command_callbacks["START"])
+                dpg.add_button(label="Stop recording", callback=self._command_callbacks["STOP"])
                 dpg.add_button(label="Show live data", callback=self._show_live_plot_window)
                 dpg.add_button(label="Process/export data", callback=self._show_processing_window)
                 dpg.add_button(label="Clear data", callback=self._clear_data_callback)
@@ -122,29 +168,36 @@ class AccelerometerReaderGUI:
                     with dpg.table(tag=DATA_LOG): # setting header_row = False causes the data not to be displayed?
                         for _ in range(5):
                             dpg.add_table_column()
+                        # Pre-create the fixed pool of rows once; streaming only overwrites their
+                        # values through the ring cursor in _drain_pending, so no widgets are
+                        # allocated or deleted while recording no matter how long it runs.
+                        for row_tags in CELL_TAGS:
+                            with dpg.table_row():
+                                for cell_tag in row_tags:
+                                    dpg.add_text("", tag=cell_tag)
                 # Display information about detected sensors and intervals next to the data log
                 with dpg.group():
                     dpg.add_text("Detected sensors:", tag="detected_sensors_header")
                     with dpg.table(header_row=False, tag="detected_sensors_table", width=130):
                         for i in range(4):
-                            dpg.add_table_column(label=f"sensor_column_{str(i)}")
+                            dpg.add_table_column(label=f"sensor_column_{i}")
                         for i,j in zip([0,1,2,3],[4,5,6,7]):
                             with dpg.table_row():
-                                dpg.add_text(f"#{str(i)}:")
-                                dpg.add_checkbox(tag=f"sensor_detected_cell_{str(i)}", enabled=False)
-                                dpg.add_text(f"#{str(j)}:")
-                                dpg.add_checkbox(tag=f"sensor_detected_cell_{str(j)}", enabled=False)
+                                dpg.add_text(f"#{i}:")
+                                dpg.add_checkbox(tag=SENSOR_CELL_TAGS[i], enabled=False)
+                                dpg.add_text(f"#{j}:")
+                                dpg.add_checkbox(tag=SENSOR_CELL_TAGS[j], enabled=False)
                     dpg.add_text("", tag="detected_sensors_info")
                     dpg.add_separator()
                     with dpg.group(tag="interval_info_displays"):
                         with dpg.group(horizontal=True):
                             dpg.add_text(f"Expected interval between readings:", tag="expected_interval_label")
+                            # Value filled in setup_gui once the data manager exists
                             dpg.add_input_text(tag="expected_interval_info",label="ms", width=60, readonly=True)
-                            dpg.set_value("expected_interval_info", str(self.data_manager.params[2]))
                         with dpg.group(horizontal=True):
                             dpg.add_text("Actual interval:", tag="actual_interval_label")
-                            dpg.add_input_text(tag="actual_interval_info",label="ms", width=60, readonly=True)
-                    dpg.add_text("", tag="interval_mismatch_info", color=(178, 34, 34), wrap=350)
+                            dpg.add_input_text(source="actual_interval_info",label="ms", width=60, readonly=True)
+                    dpg.add_text(source="interval_mismatch_info", color=(178, 34, 34), wrap=350)
 
     def _create_post_processing_tab(self):
         """Creates the contents of the post-processing tab."""
@@ -174,29 +227,57 @@ class AccelerometerReaderGUI:
             dpg.add_child_window(tag="post_processing_plots", width=650, height=500)
 
     def _update_sensors_for_postprocessing(self):
-        """Updates the sensors list for the post-processing tab by analyzing the filenames in the selected folder."""
+        """Updates the sensors list for the post-processing tab by analyzing the filenames in the selected folder.
+        The directory scan runs on the I/O pool so a huge folder (or a slow network drive) does not stall the GUI
+        thread; the combo box is filled in once the scan completes."""
         if self.open_directory_path is not None:
-            files_detected = os.listdir(self.open_directory_path)
-            # Strip the filenames in the form "S_X something.type" to detect the sensor IDs for which we have data.
-            sensor_numbers = [filename.split("_")[1].split(" ")[0] for filename in files_detected]
-            sensor_numbers = sorted(list(set(sensor_numbers)))
-            self.post_processing_sensors = sensor_numbers.copy() # To keep them separate
-            sensor_numbers.append("All")
-            dpg.configure_item("sensor_choice_post", items=sensor_numbers, default_value="All")
+            self._io_pool.submit(self._scan_postprocessing_sensors, self.open_directory_path)
         return True
 
+    def _scan_postprocessing_sensors(self, directory_path):
+        """Streams the directory entries with os.scandir and slices the sensor IDs out of filenames of the form
+        "S_X something.type" without materializing intermediate file lists."""
+        sensors = set()
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                name = entry.name
+                start = name.find("_")
+                end = name.find(" ", start + 1)
+                if start != -1 and end != -1:
+                    sensors.add(name[start + 1:end])
+        sensor_numbers = sorted(sensors)
+        self.post_processing_sensors = sensor_numbers.copy() # To keep them separate
+        sensor_numbers.append("All")
+        dpg.configure_item("sensor_choice_post", items=sensor_numbers, default_value="All")
+
     def _close_window(self, window_name):
         """Callback for the close button of data-related windows (live plotting and data processing). Deletes the window
         and its children (contents; default in delete_item) to avoid DPG's 'alias already exists' error when the window
-        is closed and reopened."""
+        is closed and reopened. Closing the live plot also shuts the plotting thread down, so reopening the window
+        starts a fresh thread instead of leaking one per re-open."""
         if window_name == "live_plot_window":
             self.stop_plot_event.set()
+            # Skip the shutdown when the plotting thread itself is re-opening the window (restart path)
+            if (self.live_plotting_thread is not None
+                    and self.live_plotting_thread is not threading.current_thread()):
+                self._plot_thread_exit.set()
+                self.live_plotting_thread.join()
+                self.live_plotting_thread = None
+                self._plot_thread_exit.clear()
         dpg.delete_item(window_name)
 
     def _connect_callback(self):
         """GUI callback calling the TCP class to establish the local connection with the Adafruit board."""
         host = dpg.get_value("host")
         port = int(dpg.get_value("port"))
+        # Show feedback immediately and do the blocking network work off the GUI thread
+        dpg.set_value(STATUS, "Connecting...")
+        self._io_pool.submit(self._connect_worker, host, port)
+
+    def _connect_worker(self, host, port):
+        """Runs the network check and connection attempt in the background; dpg.set_value is
+        thread-safe, so the results are published straight to the GUI."""
+        from modules.tcp_client import get_current_network
         get_current_network()
         if self.tcp_client.connect(host, port):
             dpg.set_value(STATUS, "Connected successfully!")
@@ -230,32 +311,36 @@ class AccelerometerReaderGUI:
     def _start_recording(self):
         """Starts the recording of sensor data."""
         self._clear_data_callback()
-        # Unset the stop event flag to start printing data.
-        self.tcp_client.stop_event.clear()
-        self.tcp_client.send_command("START")
+        self.tcp_client.start_recording()
 
     def _clear_data_callback(self):
         """Clears the values of the variables but without disconnecting, i.e., the TCP data is stored."""
         self.data_manager.clear_data()
-        # Clear the data log
-        for child in dpg.get_item_children('data_log')[1]:
-            dpg.delete_item(child)
+        # Clear the data log by blanking the cells written so far and resetting the cursor - the row
+        # widgets themselves are reused, so there is no per-row delete_item round-trip to tear down.
+        self._pending_rows.clear()
+        for row_tags in CELL_TAGS[:min(self._row_cursor, DATA_LOG_ROWS)]:
+            for cell_tag in row_tags:
+                dpg.set_value(cell_tag, "")
+        self._row_cursor = 0
+        self.tcp_client.interval_measured = False # Re-measure the interval once data flows again
         dpg.set_value(STATUS, "Data cleared successfully")
         dpg.set_value("actual_interval_info", "")
 
-    def _show_processing_window(self):
-        """Displays and handles the window with data processing options."""
-        with dpg.window(label="Processing options", tag="processing_window",
-                        autosize=True, pos=[250, 150], on_close=self._close_window("processing_window")):
+    def _build_processing_window(self):
+        """Creates the window with data processing options once at startup, hidden. Showing it later is
+        a visibility flip instead of rebuilding (and tearing down) the whole widget tree, which also
+        avoids DPG's 'alias already exists' pitfalls on reopen."""
+        with dpg.window(label="Processing options", tag="processing_window", show=False,
+                        autosize=True, pos=[250, 150], on_close=lambda: dpg.hide_item("processing_window")):
             dpg.add_text("Options to process the data right now. Note that plotting may take a while.",
                          wrap=350)
-            sensors_list = list(self.data_manager.active_sensors)
-            sensors_list.append('All')
             # Horizontal group and text instead of a label because labels are to the right, and it cannot be easily
             # changed through attributes.
             with dpg.group(horizontal=True):
                 dpg.add_text("Sensor selection       ")
-                dpg.add_combo(sensors_list, default_value='All', tag="sensor_choice", width=50)
+                # Items are refreshed from the active sensors every time the window is shown
+                dpg.add_combo(['All'], default_value='All', tag="sensor_choice", width=50)
             with dpg.group(horizontal=True):
                 dpg.add_text("Processing method ")
                 dpg.add_combo(
@@ -272,15 +357,25 @@ class AccelerometerReaderGUI:
             dpg.add_text("Saving status: Save OFF", tag="save_status_log")
             dpg.add_button(label="Run processing", callback=lambda:self._processing_callback("live"))
 
+    def _show_processing_window(self):
+        """Displays the pre-built window with data processing options, refreshing the sensor list."""
+        dpg.configure_item("sensor_choice", items=sorted(self.data_manager.active_sensors) + ['All'],
+                           default_value='All')
+        dpg.show_item("processing_window")
+
     def _processing_callback(self, sender):
         if sender == "post":
         # Post-processing tab fields
             if self.open_directory_path is None:
                 dpg.set_value(STATUS, "Select a folder with the data to process first.")
             else:
+                from modules.sensor_data_manager import post_process_dataframe
                 sensor_choice = dpg.get_value("sensor_choice_post")
-                sensor_list = self.post_processing_sensors if sensor_choice == "All" else list(sensor_choice)
-                post_process_dataframe(self.open_directory_path, sensor_list)
+                # Wrap the single choice instead of list()-ing it, which would split a multi-digit
+                # sensor ID into characters
+                sensor_list = self.post_processing_sensors if sensor_choice == "All" else [sensor_choice]
+                self._run_processing_in_background(post_process_dataframe,
+                                                   self.open_directory_path, sensor_list)
         else:
         # Processing in the "data acquisition" tab fields
             if dpg.get_value("processing_choice") == "CSV export" and self.save_directory_path is None:
@@ -289,19 +384,38 @@ class AccelerometerReaderGUI:
                                  wrap=390)
                     dpg.add_button(label="OK", callback=lambda: dpg.delete_item("processing_warning_popup"))
                     return
-            self.data_manager.process_dataframe(self.save_directory_path)
+            self._run_processing_in_background(self.data_manager.process_dataframe, self.save_directory_path)
+
+    def _run_processing_in_background(self, processing_function, *args):
+        """Submits a processing run to the I/O pool so multi-second FFT/plot/export runs do not freeze
+        the viewport. Progress messages come from the processing code itself (dpg.set_value is
+        thread-safe); failures are reported on the status bar."""
+        dpg.set_value(STATUS, "Processing started... Please wait...")
+        future = self._io_pool.submit(processing_function, *args)
+        future.add_done_callback(self._on_processing_done)
+
+    @staticmethod
+    def _on_processing_done(future):
+        error = future.exception()
+        if error is not None:
+            dpg.set_value(STATUS, f"Error processing data: {str(error)}")
 
     def _directory_select_callback(self, mode):
-        """Callback for the directory selection button. Opens a file dialog to select the directory where the data
-        will be stored, then saves its path to the GUI."""
-        filepath = tkinter.filedialog.askdirectory()
+        """Callback for the directory selection buttons. Shows the shared directory dialog and remembers
+        whether the chosen path is for saving or opening the processed data files."""
+        dpg.set_item_user_data("directory_dialog", mode)
+        dpg.show_item("directory_dialog")
+
+    def _on_directory_picked(self, sender, app_data, user_data):
+        """Callback fired by the directory dialog once a folder is chosen; saves its path to the GUI."""
+        filepath = app_data.get("file_path_name") if app_data else None
         if filepath:
             # Choose a directory either for saving or opening the processed data files.
-            if mode == "save":
+            if user_data == "save":
                 self.save_directory_path = filepath + "/Processed data"
                 dpg.set_value("chosen_save_directory_log", f"{self.save_directory_path}")
                 dpg.set_value("save_status_log", "Saving status: Save ON")
-            elif mode == "open":
+            elif user_data == "open":
                 self.open_directory_path = filepath
                 self._update_sensors_for_postprocessing()
                 dpg.set_value("chosen_open_directory_log", f"{self.open_directory_path}")
@@ -322,7 +436,15 @@ class AccelerometerReaderGUI:
                             for sensor_id in list(self.data_manager.active_sensors)[i::number_of_rows]:
                             # Create subplots and their tags, so they can be updated rather than re-created
                                 subplot_tag = f"{sensor_id}_subplot"
-                                dpg.add_subplots(3,1,tag=subplot_tag, height=380, width=380)
+                                # Precompute the axis and plot tags this sensor's subplots will use
+                                self._tag_cache[sensor_id] = (
+                                    tuple(f"x_axis_{i}_s_{sensor_id}" for i in range(1, 4)),
+                                    tuple(f"y_axis_{i}_s_{sensor_id}" for i in range(1, 4)),
+                                    tuple(f"plot_s_{sensor_id}_{label}" for label in (X_DATA, Y_DATA, Z_DATA)),
+                                )
+                                # link_all_x keeps the three stacked plots on one shared x-range,
+                                # so the update loop only has to fit a single x-axis per sensor
+                                dpg.add_subplots(3,1,tag=subplot_tag, height=380, width=380, link_all_x=True)
                                 subplot_tags.append(subplot_tag)
                 # Start the live plotting thread
                 if self.live_plotting_thread is None:
@@ -334,22 +456,47 @@ class AccelerometerReaderGUI:
                 dpg.add_text("Nothing to plot.")
 
     def _plot_live_data(self, subplot_tags):
-        """Plots the real-time acceleration vs time data for all detected sensors."""
+        """Plots the real-time acceleration vs time data for all detected sensors. The loop parks on
+        the data manager's condition until the TCP thread commits new samples and redraws at most once
+        per frame budget, instead of spinning through every subplot on a fixed sleep."""
         labels = [X_DATA, Y_DATA, Z_DATA]
-        while True:
+        frame_budget = 1.0 / TARGET_FPS
+        last_drawn = {} # sensor_id -> revision of the buffer when it was last drawn
+        frame_index = 0
+        while not self._plot_thread_exit.is_set():
+            # When both the plot and the recording are paused there is nothing to redraw - park in
+            # the kernel instead of spinning through the checks below, waking early on window close.
+            if self.stop_plot_event.is_set() and self.tcp_client.stop_event.is_set():
+                self._plot_thread_exit.wait(timeout=0.5)
+                continue
+            # Block until new data lands; the timeout keeps the stop/restart checks below responsive
+            # while the recording is idle.
+            with self.data_manager.data_cond:
+                self.data_manager.data_cond.wait(timeout=frame_budget)
+            frame_start = time.monotonic()
+            frame_index += 1
+            fit_axes = frame_index % AXIS_FIT_INTERVAL == 0
             try:
              # Plot only if the event flag is not set and the window exists (to prevent dpg crashes)
                 if dpg.does_alias_exist("live_plot_window"):
                     if not self.stop_plot_event.is_set():
                             for subplot_tag in subplot_tags:
                                 sensor_id = int(subplot_tag.split("_")[0])
-                                # Create tags for every x- and y-axis to keep the aliases separate
-                                x_tags = [f"x_axis_{i}_s_{sensor_id}" for i in range(1,4)]
-                                y_tags = [f"y_axis_{i}_s_{sensor_id}" for i in range(1,4)]
+                                # Skip sensors whose buffers are unchanged since the last draw
+                                revision = self.data_manager.revisions[sensor_id]
+                                if last_drawn.get(sensor_id) == revision:
+                                    continue
+                                last_drawn[sensor_id] = revision
+                                # Fetch the shared time window once per sensor - the three subplots
+                                # all plot against the same x data
+                                x_time = self.data_manager.data[sensor_id].window(NORMALIZED_TIMESTAMP,
+                                                                                  PLOT_WINDOW)
+                                # Reuse the tags precomputed when the window was built
+                                x_tags, y_tags, plot_tags = self._tag_cache[sensor_id]
                                 # Plot in 3 vertical subplots for every sensor
-                                for label, x_tag, y_tag in zip(labels, x_tags, y_tags):
-                                    self._create_plot_on_subplot(sensor_id, label, x_tag, y_tag, subplot_tag)
-                                time.sleep(0.05) # Slight delay to give time to fetch the data
+                                for label, x_tag, y_tag, plot_tag in zip(labels, x_tags, y_tags, plot_tags):
+                                    self._create_plot_on_subplot(sensor_id, label, x_tag, y_tag, plot_tag,
+                                                                 subplot_tag, x_time, fit_axes)
                             # Pause plotting is the recording is paused too
                             if self.tcp_client.stop_event.is_set():
                                 self.stop_plot_event.set()
@@ -359,14 +506,17 @@ class AccelerometerReaderGUI:
                         self._close_window("live_plot_window")
                         time.sleep(1) # Short delay to fetch enough data to initialize all subplots
                         self._show_live_plot_window()
-            except:
-                pass # Exceptions are usually from issues with dpg aliases, which sort themselves out, so we can pass
+            except (SystemError, KeyError):
+                pass # DPG alias races while the window is closed/reopened; they sort themselves out
+            # Enforce the global frame budget even when notifications arrive faster
+            time.sleep(max(0.0, frame_budget - (time.monotonic() - frame_start)))
 
-    def _create_plot_on_subplot(self, sensor_id, label, x_tag, y_tag, subplot_tag):
-        """Either creates individual plots on a subplot or adds values and re-adjusts the axes on existing ones."""
-        plot_tag = f"plot_s_{sensor_id}_{label}"
-        x_time = self.data_manager.data[sensor_id][NORMALIZED_TIMESTAMP]
-        y_data = self.data_manager.data[sensor_id][label]
+    def _create_plot_on_subplot(self, sensor_id, label, x_tag, y_tag, plot_tag, subplot_tag, x_time, fit_axes=True):
+        """Either creates individual plots on a subplot or adds values and re-adjusts the axes on existing ones.
+        The tags and the time window are computed once per sensor by the caller and shared by all three subplots."""
+        # Only the newest PLOT_WINDOW samples are handed to DPG, so the per-frame marshalling cost
+        # stays constant no matter how long the recording has been running.
+        y_data = self.data_manager.data[sensor_id].window(label, PLOT_WINDOW)
         if not dpg.does_item_exist(plot_tag):
             with dpg.plot(parent=subplot_tag):
                 dpg.add_plot_axis(dpg.mvXAxis, label="Time [s]", no_gridlines=True, tag=x_tag)
@@ -376,10 +526,58 @@ class AccelerometerReaderGUI:
                 if label != Z_DATA:
                     dpg.configure_item(x_tag, no_tick_marks=True, no_tick_labels=True, label="")
         else:
-            dpg.fit_axis_data(x_tag)
-            dpg.fit_axis_data(y_tag)
-            dpg.configure_item(plot_tag, x=x_time, y=y_data)
+            # Refit only every AXIS_FIT_INTERVAL redraws - fitting walks the whole series
+            if fit_axes:
+                # The subplot links all x-axes, so fitting the bottom one is enough for all three plots
+                if label == Z_DATA:
+                    dpg.fit_axis_data(x_tag)
+                dpg.fit_axis_data(y_tag)
+            # set_value is the fast path for line series - it skips configure_item's generic
+            # keyword validation and just swaps the series data in
+            dpg.set_value(plot_tag, [x_time, y_data])
+
+    def _drain_pending(self):
+        """Flushes the sensor rows accumulated by the TCP thread into the data log in one batch per frame,
+        instead of issuing one set of DPG calls per reading from the receiver thread."""
+        if not self._pending_rows:
+            return
+        # Take the DPG mutex once for the whole batch instead of once per set_value call, and cap
+        # the rows applied per frame so a burst cannot blow the frame budget
+        budget = MAX_ROWS_PER_FRAME
+        with dpg.mutex():
+            while self._pending_rows and budget > 0:
+                budget -= 1
+                # Rows arrive as field tuples already split once by the receiver thread
+                parts = self._pending_rows.popleft()
+                # Overwrite the oldest row in the pool; column order matches the header table
+                row_tags = CELL_TAGS[self._row_cursor % DATA_LOG_ROWS]
+                for cell_tag, value in zip(row_tags, (parts[0], parts[2], parts[3], parts[4], parts[1])):
+                    dpg.set_value(cell_tag, value)
+                self._row_cursor += 1
 
     def run(self):
-        dpg.start_dearpygui()
+        """Runs the render loop manually so frames are only drawn when there is user input or new sensor data,
+        instead of redrawing a mostly static form at full framerate."""
+        dpg.set_viewport_vsync(True)
+        dpg.configure_app(wait_for_input=True)
+        frame_budget = 1.0 / TARGET_FPS
+        while dpg.is_dearpygui_running():
+            start = time.perf_counter()
+            self._drain_pending()
+            dpg.render_dearpygui_frame()
+            # Return to wait mode only while idle. The TCP thread's configure_app wake-up takes
+            # effect at the next frame and cannot interrupt a render loop already parked in the
+            # input wait, so while data is streaming (or rows are still queued) the loop must stay
+            # in timed-render mode - re-arming unconditionally would freeze the data log and live
+            # plots until the user moves the mouse.
+            streaming = self.tcp_client.connected and not self.tcp_client.stop_event.is_set()
+            dpg.configure_app(wait_for_input=not (streaming or self._pending_rows))
+            # Sleep off the rest of the frame budget - the TCP thread keeps accumulating rows at
+            # full speed, the GUI only needs to draw them at TARGET_FPS.
+            elapsed = time.perf_counter() - start
+            time.sleep(max(0.0, frame_budget - elapsed))
+        # Stop background work before tearing DPG down - the pool's threads are non-daemon, so a
+        # still-running task would otherwise keep the process alive after the window closes and
+        # then call dpg.set_value into a destroyed context
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
         dpg.destroy_context()
